@@ -1,23 +1,64 @@
 """Support for the Dark Sky weather service."""
+import asyncio
+from datetime import timedelta
+from functools import partial
 import voluptuous as vol
 import logging
-from darksky.api import DarkSkyAsync  # pylint: disable=import-error
-from darksky.types import languages, units  # pylint: disable=import-error
+from time import monotonic
+from aiohttp import ClientError
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.const import (
+    CONF_API_KEY,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    EVENT_HOMEASSISTANT_START,
+)
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+import homeassistant.util.dt as dt_util
 
 from .const import (
+    API_URL,
+    ATTR_END_DATE,
+    ATTR_MAX_AGE,
+    ATTR_START_DATE,
+    BACKFILL_MAX_DAYS,
     CONF_LANGUAGE,
+    CONF_LATENCY_BUDGET,
+    CONF_MIRROR_URL,
+    CONF_PROFILE_STARTUP,
+    CONF_SHARED_CACHE,
     CONF_UNITS,
     DARKSKY_PLATFORMS,
+    DATA_DARKSKY,
+    DATA_PROFILER,
+    DATA_PUBLISHER,
+    DEFAULT_LANGUAGE,
+    DEFAULT_LATENCY_BUDGET,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    HISTORY_CACHE_DIR,
+    SERVICE_BACKFILL,
+    SERVICE_REFRESH,
+    SHARED_CACHE_POLL_INTERVAL,
+    SUMMARY_EXCLUDE,
+    SUMMARY_SCAN_INTERVAL,
+    LANGUAGES,
+    TIME_MACHINE_EXCLUDE,
+    UNITS,
+    UNITS_SI,
+    UNITS_US,
 )
-from .shared import format_daily_forecast, format_hourly_forecast
+from .profiling import StartupProfiler
+from .publisher import PublishScheduler
+from .refresh import CoalescedRefresh
+from .request_policy import RequestPolicy
+from .snapshot import SnapshotHistory
+from .websocket import async_setup_websocket
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,16 +69,33 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Required(CONF_API_KEY): cv.string,
                 vol.Optional(CONF_LATITUDE): cv.latitude,
                 vol.Optional(CONF_LONGITUDE): cv.longitude,
-                vol.Optional(CONF_UNITS): vol.In(units.__dict__.values()),
-                vol.Optional(CONF_LANGUAGE, default=languages.ENGLISH): vol.In(
-                    languages.__dict__.values()
+                vol.Optional(CONF_UNITS): vol.In(UNITS),
+                vol.Optional(CONF_LANGUAGE, default=DEFAULT_LANGUAGE): vol.In(
+                    LANGUAGES
                 ),
+                vol.Optional(CONF_SHARED_CACHE): cv.string,
+                vol.Optional(CONF_MIRROR_URL): cv.url,
+                vol.Optional(
+                    CONF_LATENCY_BUDGET, default=DEFAULT_LATENCY_BUDGET
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(CONF_PROFILE_STARTUP, default=False): cv.boolean,
             },
         )
     },
     extra=vol.ALLOW_EXTRA,
 )
 
+BACKFILL_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+        vol.Inclusive(CONF_LATITUDE, "coordinates"): cv.latitude,
+        vol.Inclusive(CONF_LONGITUDE, "coordinates"): cv.longitude,
+    }
+)
+
+REFRESH_SCHEMA = vol.Schema({vol.Optional(ATTR_MAX_AGE): cv.positive_int})
+
 
 async def async_setup_entry(hass: HomeAssistant, config: ConfigEntry) -> bool:
     """Set up Darksky as config entries."""
@@ -50,7 +108,26 @@ async def async_setup_entry(hass: HomeAssistant, config: ConfigEntry) -> bool:
 
 async def async_setup(hass: HomeAssistant, config: ConfigEntry):
     """Set up configured Darksky."""
+    profiler = StartupProfiler(config[DOMAIN][CONF_PROFILE_STARTUP])
+    hass.data[DATA_PROFILER] = profiler
+
+    if profiler.enabled:
+
+        async def async_log_report(event):
+            """Log the startup timings once Home Assistant has started."""
+            profiler.log_report()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START, async_log_report)
+
+    with profiler.measure("setup"):
+        return await _async_setup(hass, config, profiler)
+
+
+async def _async_setup(hass: HomeAssistant, config: ConfigEntry, profiler):
+    """Set up the coordinator, services and websocket commands."""
     darksky = DarkSkyData(hass, config)
+    await darksky.async_setup()
+    hass.data[DATA_DARKSKY] = darksky
 
     hass.data[DOMAIN] = DataUpdateCoordinator(
         hass,
@@ -59,8 +136,52 @@ async def async_setup(hass: HomeAssistant, config: ConfigEntry):
         update_method=darksky.async_request_refresh,
         update_interval=DEFAULT_SCAN_INTERVAL,
     )
+    hass.data[DATA_PUBLISHER] = PublishScheduler(hass, hass.data[DOMAIN])
+    refresh = CoalescedRefresh(hass, hass.data[DOMAIN])
 
-    await hass.data[DOMAIN].async_refresh()
+    with profiler.measure("first refresh"):
+        await hass.data[DOMAIN].async_refresh()
+
+    async_setup_websocket(hass)
+
+    async def async_handle_backfill(call: ServiceCall):
+        """Start a historical backfill in the background."""
+        today = dt_util.now().date()
+        start_date = call.data[ATTR_START_DATE]
+        end_date = call.data.get(ATTR_END_DATE, today - timedelta(days=1))
+        if start_date > end_date:
+            raise HomeAssistantError("start_date must not be after end_date")
+        if end_date >= today:
+            raise HomeAssistantError("end_date must be in the past")
+        if (end_date - start_date).days + 1 > BACKFILL_MAX_DAYS:
+            raise HomeAssistantError(
+                f"A backfill can cover at most {BACKFILL_MAX_DAYS} days"
+            )
+
+        backfill_module = await profiler.async_import_module(hass, ".backfill")
+        backfill = backfill_module.HistoryBackfill(
+            hass, darksky, hass.config.path(HISTORY_CACHE_DIR)
+        )
+        hass.async_create_task(
+            backfill.async_backfill(
+                call.data.get(CONF_LATITUDE, darksky.latitude),
+                call.data.get(CONF_LONGITUDE, darksky.longitude),
+                start_date,
+                end_date,
+            )
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKFILL, async_handle_backfill, schema=BACKFILL_SCHEMA
+    )
+
+    async def async_handle_refresh(call: ServiceCall):
+        """Refresh the data, sharing one fetch between concurrent callers."""
+        await refresh.async_refresh(call.data.get(ATTR_MAX_AGE))
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH, async_handle_refresh, schema=REFRESH_SCHEMA
+    )
 
     return True
 
@@ -83,29 +204,216 @@ class DarkSkyData:
         long = config[DOMAIN].get(CONF_LONGITUDE, hass.config.longitude)
 
         self._hass = hass
-        self._darksky = DarkSkyAsync(config[DOMAIN][CONF_API_KEY])
+        self._profiler = hass.data[DATA_PROFILER]
+        self._session = async_get_clientsession(hass)
+        self._api_key = config[DOMAIN][CONF_API_KEY]
         self._units = config[DOMAIN].get(CONF_UNITS)
         self._latitude = lat
         self._longitude = long
         self._language = config[DOMAIN][CONF_LANGUAGE]
+        self._shared_cache_path = config[DOMAIN].get(CONF_SHARED_CACHE)
+        if self._shared_cache_path is not None:
+            self._shared_cache_path = hass.config.path(self._shared_cache_path)
+        self._shared_cache = None
+        self._summaries = {}
+        self.history = SnapshotHistory()
+        self._mirror_url = config[DOMAIN].get(CONF_MIRROR_URL)
+        self._latency_budget = config[DOMAIN][CONF_LATENCY_BUDGET]
+        self.request_policy = RequestPolicy(self._latency_budget)
 
         if self._units is None and hass.config.units.is_metric:
-            self._units = units.SI
+            self._units = UNITS_SI
         elif self._units is None:
-            self._units = units.US
+            self._units = UNITS_US
+
+    @property
+    def latitude(self):
+        """Return the configured latitude."""
+        return self._latitude
+
+    @property
+    def longitude(self):
+        """Return the configured longitude."""
+        return self._longitude
+
+    @property
+    def units(self):
+        """Return the unit system requested from the API."""
+        return self._units
+
+    @property
+    def language(self):
+        """Return the language of the main forecast."""
+        return self._language
+
+    def add_summary_language(self, language):
+        """
+        Request summaries in an extra language.
+
+        Returns True if the language was not requested before.
+        """
+        if language == self._language or language in self._summaries:
+            return False
+        self._summaries[language] = (None, None)
+        return True
+
+    async def async_setup(self):
+        """Open the shared cache, if configured."""
+        if self._shared_cache_path is not None:
+            self._shared_cache = await self._hass.async_add_executor_job(
+                self._open_shared_cache
+            )
+
+    def _open_shared_cache(self):
+        """Import the cache backend on first use and open the cache file."""
+        cache = self._profiler.import_module(".cache")
+        return cache.SharedForecastCache(self._shared_cache_path, DEFAULT_SCAN_INTERVAL)
+
+    def _parse(self, func_name, raw):
+        """
+        Parse a raw response with a function of the parser module.
+
+        Runs in the executor, so importing the parser and the darksky models
+        on first use does not happen on the event loop either.
+        """
+        return getattr(self._profiler.import_module(".parser"), func_name)(raw)
 
     async def async_request_refresh(self):
-        """Get the latest data from Dark Sky."""
+        """
+        Get the latest data from Dark Sky.
+
+        Fetching the forecast, including waiting on the shared cache, and
+        updating the extra language summaries share one latency budget.
+        """
+        deadline = monotonic() + self._latency_budget
         try:
-            res = await self._darksky.get_forecast(
-                self._latitude,
-                self._longitude,
-                lang=self._language,
-                values_units=self._units,
+            if self._shared_cache is None:
+                fetch = self._async_fetch_forecast()
+            else:
+                fetch = self._async_fetch_shared()
+            raw = await asyncio.wait_for(fetch, self._latency_budget)
+            res = await self._hass.async_add_executor_job(
+                self._parse, "parse_forecast", raw
             )
-            res.ha_daily_forecast = format_daily_forecast(res.daily.data)
-            res.ha_hourly_forecast = format_hourly_forecast(res.hourly.data)
-            res.units = res.flags.units
-            return res
-        except LookupError:
+        except (ClientError, asyncio.TimeoutError, LookupError, ValueError):
             raise UpdateFailed("Failed to fetch data")
+
+        await self.async_update_summaries(deadline - monotonic())
+        res.summaries = self.summaries
+        return self.history.add(res)
+
+    @property
+    def summaries(self):
+        """Return the summaries fetched so far, keyed by language."""
+        return {
+            language: summaries
+            for language, (_, summaries) in self._summaries.items()
+            if summaries is not None
+        }
+
+    async def async_update_summaries(self, timeout=None):
+        """
+        Refresh the summaries of the extra languages.
+
+        The API has no text-only request, so the extra languages are fetched
+        on the much longer SUMMARY_SCAN_INTERVAL and only their summary text is
+        kept. A failure, or running out of the timeout, keeps the previous text
+        instead of failing the refresh.
+        """
+        now = monotonic()
+        stale = [
+            language
+            for language, (fetched, _) in self._summaries.items()
+            if fetched is None or now - fetched >= SUMMARY_SCAN_INTERVAL
+        ]
+        if not stale:
+            return
+
+        if timeout is None:
+            timeout = self._latency_budget
+        deadline = now + timeout
+        for language in stale:
+            try:
+                raw = await asyncio.wait_for(
+                    self._async_fetch(language, SUMMARY_EXCLUDE),
+                    max(deadline - monotonic(), 0),
+                )
+                summaries = await self._hass.async_add_executor_job(
+                    self._parse, "parse_summaries", raw
+                )
+            except (ClientError, asyncio.TimeoutError, LookupError, ValueError):
+                _LOGGER.warning("Failed to fetch Dark Sky summaries in %s", language)
+                continue
+            self._summaries[language] = (now, summaries)
+
+    async def async_fetch_time_machine(self, latitude, longitude, timestamp):
+        """Fetch the raw Time Machine body for the day containing timestamp."""
+        url = f"{API_URL}/{self._api_key}/{latitude},{longitude},{timestamp}"
+        params = {
+            "lang": self._language,
+            "units": self._units,
+            "exclude": TIME_MACHINE_EXCLUDE,
+        }
+        async with self._session.get(url, params=params) as resp:
+            resp.raise_for_status()
+            return await resp.read()
+
+    async def _async_fetch_forecast(self):
+        """
+        Fetch the raw forecast body under the request policy.
+
+        The hedged request goes to the mirror if one is configured, otherwise
+        to the API itself.
+        """
+        return await self.request_policy.async_run(
+            self._async_fetch,
+            partial(self._async_fetch, base_url=self._mirror_url or API_URL),
+        )
+
+    async def _async_fetch(self, language=None, exclude=None, base_url=API_URL):
+        """Fetch the raw forecast body from the API."""
+        url = f"{base_url}/{self._api_key}/{self._latitude},{self._longitude}"
+        params = {"lang": language or self._language, "units": self._units}
+        if exclude is not None:
+            params["exclude"] = exclude
+        async with self._session.get(url, params=params) as resp:
+            resp.raise_for_status()
+            return await resp.read()
+
+    async def _async_fetch_shared(self):
+        """
+        Fetch the raw forecast body through the shared cache.
+
+        Only the instance holding the lease for this location calls the API,
+        the others wait for it to store the response.
+        """
+        key = f"{self._latitude},{self._longitude},{self._language},{self._units}"
+        try:
+            while True:
+                body, acquired = await self._hass.async_add_executor_job(
+                    self._shared_cache.acquire, key
+                )
+                if body is not None:
+                    return body
+                if acquired:
+                    break
+                await asyncio.sleep(SHARED_CACHE_POLL_INTERVAL)
+        except HomeAssistantError as err:
+            # The cache raises SharedCacheError, importing it would load sqlite3
+            _LOGGER.warning("Shared cache unavailable, fetching directly: %s", err)
+            return await self._async_fetch_forecast()
+
+        try:
+            body = await self._async_fetch_forecast()
+        except (Exception, asyncio.CancelledError):
+            await self._async_cache_call(self._shared_cache.release, key)
+            raise
+        await self._async_cache_call(self._shared_cache.put, key, body)
+        return body
+
+    async def _async_cache_call(self, target, *args):
+        """Run a shared cache write, logging instead of failing on errors."""
+        try:
+            await self._hass.async_add_executor_job(target, *args)
+        except HomeAssistantError as err:
+            _LOGGER.warning("Failed to update the shared cache: %s", err)
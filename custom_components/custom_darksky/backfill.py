@@ -0,0 +1,167 @@
+"""Historical backfill through the Dark Sky Time Machine endpoint."""
+import asyncio
+from datetime import timedelta
+import json
+import logging
+import os
+
+from homeassistant.helpers.storage import Store
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    BACKFILL_WORKERS,
+    DEGREE_DAY_BASE_CELSIUS,
+    DEGREE_DAY_BASE_FAHRENHEIT,
+    DOMAIN,
+    HISTORY_STORAGE_VERSION,
+    UNITS_US,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HistoryBackfill:
+    """
+    Fetch past days for a location and store their daily aggregates.
+
+    Every fetched day is stored as a JSON file in the cache directory and is
+    never fetched again, historical days do not change. Progress is therefore
+    resumable: an interrupted backfill only fetches the missing days when run
+    again.
+
+    The mean, minimum and maximum temperature and the heating and cooling
+    degree-days of each day are kept in a Store per location and unit system.
+    """
+
+    def __init__(self, hass, darksky, cache_dir, workers=BACKFILL_WORKERS):
+        """Initialize the backfill."""
+        self._hass = hass
+        self._darksky = darksky
+        self._cache_dir = cache_dir
+        self._workers = workers
+
+    async def async_backfill(self, latitude, longitude, start_date, end_date):
+        """Fetch every day from start_date to end_date and store them."""
+        days = [
+            start_date + timedelta(days=offset)
+            for offset in range((end_date - start_date).days + 1)
+        ]
+        queue = asyncio.Queue()
+        for day in days:
+            queue.put_nowait(day)
+
+        results = {}
+        workers = [
+            self._hass.async_create_task(
+                self._async_worker(queue, results, latitude, longitude)
+            )
+            for _ in range(min(self._workers, len(days)))
+        ]
+        await asyncio.gather(*workers)
+
+        _LOGGER.info(
+            "Dark Sky backfill for %s,%s: %d of %d days available",
+            latitude,
+            longitude,
+            len(results),
+            len(days),
+        )
+        await self._async_store_aggregates(latitude, longitude, results)
+
+    async def _async_worker(self, queue, results, latitude, longitude):
+        """Fetch days from the queue until it is empty."""
+        while not queue.empty():
+            day = queue.get_nowait()
+            try:
+                results[day] = await self._async_get_day(latitude, longitude, day)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Failed to backfill Dark Sky data for %s", day)
+
+    async def _async_get_day(self, latitude, longitude, day):
+        """Return one day of history, from the cache when possible."""
+        path = os.path.join(
+            self._cache_dir,
+            _location_key(latitude, longitude, self._darksky.units),
+            f"{day.isoformat()}.json",
+        )
+        data = await self._hass.async_add_executor_job(_load_day, path)
+        if data is not None:
+            return data
+
+        noon = dt_util.start_of_local_day(day) + timedelta(hours=12)
+        timestamp = int(dt_util.as_timestamp(noon))
+        raw = await self._darksky.async_fetch_time_machine(
+            latitude, longitude, timestamp
+        )
+        return await self._hass.async_add_executor_job(_store_day, path, raw)
+
+    async def _async_store_aggregates(self, latitude, longitude, results):
+        """Merge the aggregates of the fetched days into the location's Store."""
+        key = _location_key(latitude, longitude, self._darksky.units)
+        store = Store(self._hass, HISTORY_STORAGE_VERSION, f"{DOMAIN}_history_{key}")
+        stored = await store.async_load() or {
+            "latitude": latitude,
+            "longitude": longitude,
+            "units": self._darksky.units,
+            "days": {},
+        }
+        for day, data in results.items():
+            aggregates = _daily_aggregates(data)
+            if aggregates is not None:
+                stored["days"][day.isoformat()] = aggregates
+        await store.async_save(stored)
+
+
+def _location_key(latitude, longitude, units):
+    """
+    Return the cache and storage key of a location and unit system.
+
+    The sign and decimal point are kept, so locations that only differ in
+    sign or in where the digits are split do not share a key.
+    """
+    return f"{latitude:+.4f}_{longitude:+.4f}_{units}"
+
+
+def _daily_aggregates(data):
+    """Return the temperature aggregates and degree-days of one fetched day."""
+    temperatures = [
+        hour["temperature"]
+        for hour in data.get("hourly", {}).get("data", [])
+        if hour.get("temperature") is not None
+    ]
+    if not temperatures:
+        return None
+
+    mean = sum(temperatures) / len(temperatures)
+    if data.get("flags", {}).get("units") == UNITS_US:
+        base, unit = DEGREE_DAY_BASE_FAHRENHEIT, "°F"
+    else:
+        base, unit = DEGREE_DAY_BASE_CELSIUS, "°C"
+    return {
+        "temperature_mean": round(mean, 2),
+        "temperature_min": min(temperatures),
+        "temperature_max": max(temperatures),
+        "heating_degree_days": round(max(base - mean, 0), 2),
+        "cooling_degree_days": round(max(mean - base, 0), 2),
+        "unit_of_measurement": unit,
+    }
+
+
+def _load_day(path):
+    """Load a cached day, or return None if it was not fetched yet."""
+    try:
+        with open(path, "rb") as fp:
+            return json.load(fp)
+    except FileNotFoundError:
+        return None
+
+
+def _store_day(path, raw):
+    """Write a fetched day to the cache atomically and return it decoded."""
+    data = json.loads(raw)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as fp:
+        fp.write(raw)
+    os.replace(tmp_path, path)
+    return data
@@ -0,0 +1,117 @@
+"""Host-local forecast cache shared between Home Assistant instances."""
+from contextlib import closing
+from functools import wraps
+import os
+import sqlite3
+import time
+import uuid
+
+from homeassistant.exceptions import HomeAssistantError
+
+LOCK_TIMEOUT = 10
+LEASE_TIMEOUT = 30
+
+
+class SharedCacheError(HomeAssistantError):
+    """The shared cache file could not be read or written."""
+
+
+def _raise_cache_errors(func):
+    """Turn SQLite errors into SharedCacheError, so callers need no sqlite3."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except sqlite3.Error as err:
+            raise SharedCacheError(str(err)) from err
+
+    return wrapper
+
+
+class SharedForecastCache:
+    """
+    SQLite backed cache of raw forecast responses.
+
+    Several Home Assistant instances on one host can point at the same file.
+    Before calling the API an instance acquires a lease on the cache key, so
+    only one process fetches a given key per TTL window while the others wait
+    for the result. All methods block and must run in an executor and raise
+    SharedCacheError if the cache file cannot be used.
+    """
+
+    @_raise_cache_errors
+    def __init__(self, path, ttl):
+        """Initialize the cache."""
+        self._path = path
+        self._ttl = ttl.total_seconds()
+        self._owner = f"{os.getpid()}:{uuid.uuid4().hex}"
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS forecast "
+                "(key TEXT PRIMARY KEY, fetched REAL NOT NULL, body BLOB NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS lease "
+                "(key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        """Open a connection in autocommit mode, locking is done explicitly."""
+        return sqlite3.connect(self._path, timeout=LOCK_TIMEOUT, isolation_level=None)
+
+    @_raise_cache_errors
+    def acquire(self, key):
+        """
+        Return a cached body or a lease to fetch it.
+
+        Returns a tuple (body, acquired). body is the cached response when it
+        is still fresh. Otherwise acquired tells whether this instance now
+        holds the lease and should fetch; if not, another instance is already
+        fetching and the caller should retry shortly.
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT fetched, body FROM forecast WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[0] < self._ttl:
+                    return row[1], False
+
+                row = conn.execute(
+                    "SELECT owner, expires FROM lease WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[0] != self._owner and row[1] > now:
+                    return None, False
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO lease (key, owner, expires) VALUES (?, ?, ?)",
+                    (key, self._owner, now + LEASE_TIMEOUT),
+                )
+                return None, True
+            finally:
+                conn.execute("COMMIT")
+
+    @_raise_cache_errors
+    def put(self, key, body):
+        """Store a freshly fetched body and release the lease."""
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO forecast (key, fetched, body) VALUES (?, ?, ?)",
+                (key, time.time(), body),
+            )
+            conn.execute(
+                "DELETE FROM lease WHERE key = ? AND owner = ?", (key, self._owner)
+            )
+            conn.execute("COMMIT")
+
+    @_raise_cache_errors
+    def release(self, key):
+        """Release the lease without storing anything, e.g. after a failed fetch."""
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "DELETE FROM lease WHERE key = ? AND owner = ?", (key, self._owner)
+            )
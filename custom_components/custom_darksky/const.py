@@ -3,206 +3,131 @@ from datetime import timedelta
 DEFAULT_NAME = "Custom Dark Sky"
 DEFAULT_SCAN_INTERVAL = timedelta(minutes=3)
 DEFAULT_MODE = "hourly"
+SHARED_CACHE_POLL_INTERVAL = 1
+REFRESH_DEBOUNCE = 1
+
+DEFAULT_LATENCY_BUDGET = 10
+HEDGE_DEFAULT_DELAY = 2
+HEDGE_MIN_SAMPLES = 10
+HEDGE_PERCENTILE = 0.95
+LATENCY_WINDOW = 100
+
+BACKFILL_MAX_DAYS = 366
+BACKFILL_WORKERS = 4
+HISTORY_CACHE_DIR = ".storage/custom_darksky_history"
+HISTORY_STORAGE_VERSION = 1
+DEGREE_DAY_BASE_CELSIUS = 18
+DEGREE_DAY_BASE_FAHRENHEIT = 65
+TIME_MACHINE_EXCLUDE = "currently,minutely,alerts"
+
+SUMMARY_EXCLUDE = "minutely,alerts,flags"
+SUMMARY_SCAN_INTERVAL = 3600
+
+SNAPSHOT_HISTORY_SIZE = 2
+
+PUBLISH_CHUNK_SIZE = 20
+PUBLISH_PRIORITY_CURRENTLY = 0
+PUBLISH_PRIORITY_FORECAST = 1
+
+API_URL = "https://api.darksky.net/forecast"
 
 ATTRIBUTION = "Powered by Dark Sky"
 
-ALERTS_ATTRS = ["time", "description", "expires", "severity", "uri", "regions", "title"]
+ATTR_DAILY = "daily"
+ATTR_END_DATE = "end_date"
+ATTR_HOURLY = "hourly"
+ATTR_MAX_AGE = "max_age"
+ATTR_START_DATE = "start_date"
 
 CONF_FORECAST = "forecast"
+CONF_FORECAST_LIMIT = "forecast_limit"
+CONF_FORECAST_MATRIX = "forecast_matrix"
 CONF_HOURLY_FORECAST = "hourly_forecast"
 CONF_LANGUAGE = "language"
+CONF_LATENCY_BUDGET = "latency_budget"
+CONF_MIRROR_URL = "mirror_url"
+CONF_PROFILE_STARTUP = "profile_startup"
+CONF_SHARED_CACHE = "shared_cache"
 CONF_UNITS = "units"
 
 DOMAIN = "custom_darksky"
 
-DARKSKY_PLATFORMS = ("sensor", "weather")
-
-FORECAST_MODE = ["hourly", "daily"]
-
-DEPRECATED_SENSOR_TYPES = {
-    "apparent_temperature_max",
-    "apparent_temperature_min",
-    "temperature_max",
-    "temperature_min",
-}
-
-SENSOR_LABELS = {
-    "alerts": "Alerts",
-    "apparent_temperature_high": "Daytime High Apparent Temperature",
-    "apparent_temperature_low": "Overnight Low Apparent Temperature",
-    "apparent_temperature_max": "Daily High Apparent Temperature",
-    "apparent_temperature_min": "Daily Low Apparent Temperature",
-    "apparent_temperature": "Apparent Temperature",
-    "cloud_cover": "Cloud Coverage",
-    "daily_summary": "Daily Summary",
-    "dew_point": "Dew Point",
-    "hourly_summary": "Hourly Summary",
-    "humidity": "Humidity",
-    "icon": "Icon",
-    "minutely_summary": "Minutely Summary",
-    "moon_phase": "Moon Phase",
-    "nearest_storm_bearing": "Nearest Storm Bearing",
-    "nearest_storm_distance": "Nearest Storm Distance",
-    "ozone": "Ozone",
-    "precip_accumulation": "Precip Accumulation",
-    "precip_intensity_max": "Daily Max Precip Intensity",
-    "precip_intensity": "Precip Intensity",
-    "precip_probability": "Precip Probability",
-    "precip_type": "Precip",
-    "pressure": "Pressure",
-    "summary": "Summary",
-    "sunrise_time": "Sunrise",
-    "sunset_time": "Sunset",
-    "temperature_high": "Daytime High Temperature",
-    "temperature_low": "Overnight Low Temperature",
-    "temperature_max": "Daily High Temperature",
-    "temperature_min": "Daily Low Temperature",
-    "temperature": "Temperature",
-    "uv_index": "UV Index",
-    "visibility": "Visibility",
-    "wind_bearing": "Wind Bearing",
-    "wind_gust": "Wind Gust",
-    "wind_speed": "Wind Speed",
-}
-
+DATA_DARKSKY = f"{DOMAIN}_data"
+DATA_PROFILER = f"{DOMAIN}_profiler"
+DATA_PUBLISHER = f"{DOMAIN}_publisher"
 
-CURRENTLY_SENSOR = [
-    "apparent_temperature",
-    "cloud_cover",
-    "dew_point",
-    "humidity",
-    "icon",
-    "nearest_storm_bearing",
-    "nearest_storm_distance",
-    "ozone",
-    "precip_intensity",
-    "precip_probability",
-    "precip_type",
-    "pressure",
-    "summary",
-    "temperature",
-    "uv_index",
-    "visibility",
-    "wind_bearing",
-    "wind_gust",
-    "wind_speed",
-]
+SERVICE_BACKFILL = "backfill"
+SERVICE_REFRESH = "refresh"
 
-DAILY_SENSOR = [
-    "apparent_temperature_high",
-    "apparent_temperature_low",
-    "apparent_temperature_max",
-    "apparent_temperature_min",
-    "cloud_cover",
-    "dew_point",
-    "humidity",
-    "icon",
-    "moon_phase",
-    "ozone",
-    "precip_accumulation",
-    "precip_intensity_max",
-    "precip_intensity",
-    "precip_probability",
-    "precip_type",
-    "pressure",
-    "summary",
-    "sunrise_time",
-    "sunset_time",
-    "temperature_high",
-    "temperature_low",
-    "temperature_max",
-    "temperature_min",
-    "uv_index",
-    "visibility",
-    "wind_bearing",
-    "wind_gust",
-    "wind_speed",
-]
+DARKSKY_PLATFORMS = ("sensor", "weather")
 
-HOURLY_SENSOR = [
-    "apparent_temperature",
-    "cloud_cover",
-    "dew_point",
-    "humidity",
-    "icon",
-    "ozone",
-    "precip_accumulation",
-    "precip_intensity",
-    "precip_probability",
-    "precip_type",
-    "pressure",
-    "summary",
-    "temperature",
-    "uv_index",
-    "visibility",
-    "wind_bearing",
-    "wind_gust",
-    "wind_speed",
-]
+FORECAST_MODE = ["hourly", "daily"]
 
-MINUTELY_SENSOR = [
-    "precip_intensity",
-    "precip_probability",
-    "precip_type",
+LANGUAGES = [
+    "ar",
+    "az",
+    "be",
+    "bg",
+    "bn",
+    "bs",
+    "ca",
+    "cs",
+    "da",
+    "de",
+    "el",
+    "en",
+    "eo",
+    "es",
+    "et",
+    "fi",
+    "fr",
+    "he",
+    "hi",
+    "hr",
+    "hu",
+    "id",
+    "is",
+    "it",
+    "ja",
+    "ka",
+    "kn",
+    "ko",
+    "kw",
+    "lv",
+    "ml",
+    "mr",
+    "nb",
+    "nl",
+    "no",
+    "pa",
+    "pl",
+    "pt",
+    "ro",
+    "ru",
+    "sk",
+    "sl",
+    "sr",
+    "sv",
+    "ta",
+    "te",
+    "tet",
+    "tr",
+    "uk",
+    "ur",
+    "x-pig-latin",
+    "zh",
+    "zh-tw",
 ]
+DEFAULT_LANGUAGE = "en"
 
+UNITS = ["auto", "ca", "uk2", "us", "si"]
+UNITS_CA = "ca"
+UNITS_SI = "si"
+UNITS_UK2 = "uk2"
+UNITS_US = "us"
 
-CONDITION_PICTURES = {
-    "clear-day": "/static/images/darksky/weather-sunny.svg",
-    "clear-night": "/static/images/darksky/weather-night.svg",
-    "cloudy": "/static/images/darksky/weather-cloudy.svg",
-    "fog": "/static/images/darksky/weather-fog.svg",
-    "partly-cloudy-day": "/static/images/darksky/weather-partlycloudy.svg",
-    "partly-cloudy-night": "/static/images/darksky/weather-cloudy.svg",
-    "rain": "/static/images/darksky/weather-pouring.svg",
-    "sleet": "/static/images/darksky/weather-hail.svg",
-    "snow": "/static/images/darksky/weather-snowy.svg",
-    "wind": "/static/images/darksky/weather-windy.svg",
-}
-
-ICONS = {
-    "alerts": "mdi:alert-circle-outline",
-    "apparent_temperature_high": "mdi:thermometer",
-    "apparent_temperature_low": "mdi:thermometer",
-    "apparent_temperature_max": "mdi:thermometer",
-    "apparent_temperature_min": "mdi:thermometer",
-    "apparent_temperature": "mdi:thermometer",
-    "clear-day": "mdi:weather-sunny",
-    "clear-night": "mdi:weather-night",
-    "cloud_cover": "mdi:weather-partly-cloudy",
-    "cloudy": "mdi:weather-cloudy",
-    "dew_point": "mdi:thermometer",
-    "fog": "mdi:weather-fog",
-    "humidity": "mdi:water-percent",
-    "moon_phase": "mdi:weather-night",
-    "nearest_storm_bearing": "mdi:weather-lightning",
-    "nearest_storm_distance": "mdi:weather-lightning",
-    "ozone": "mdi:eye",
-    "partly-cloudy-day": "mdi:weather-partly-cloudy",
-    "partly-cloudy-night": "mdi:weather-night-partly-cloudy",
-    "precip_accumulation": "mdi:weather-snowy",
-    "precip_intensity_max": "mdi:thermometer",
-    "precip_intensity": "mdi:weather-rainy",
-    "precip_probability": "mdi:water-percent",
-    "precip_type": "mdi:weather-pouring",
-    "pressure": "mdi:gauge",
-    "rain": "mdi:weather-pouring",
-    "sleet": "mdi:weather-snowy-rainy",
-    "snow": "mdi:weather-snowy",
-    "sunrise_time": "mdi:white-balance-sunny",
-    "sunset_time": "mdi:weather-night",
-    "temperature_high": "mdi:thermometer",
-    "temperature_low": "mdi:thermometer",
-    "temperature_max": "mdi:thermometer",
-    "temperature_min": "mdi:thermometer",
-    "temperature": "mdi:thermometer",
-    "uv_index": "mdi:weather-sunny",
-    "visibility": "mdi:eye",
-    "wind_bearing": "mdi:compass",
-    "wind_gust": "mdi:weather-windy-variant",
-    "wind_speed": "mdi:weather-windy",
-    "wind": "mdi:weather-windy",
-}
+WS_TYPE_FORECAST = f"{DOMAIN}/forecast"
+WS_TYPE_FORECAST_MATRIX = f"{DOMAIN}/forecast_matrix"
 
 MAP_CONDITION = {
     "clear-day": "sunny",
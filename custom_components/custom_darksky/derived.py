@@ -0,0 +1,147 @@
+"""Values computed locally instead of fetched from the Dark Sky API."""
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import math
+
+from .const import UNITS_CA, UNITS_UK2, UNITS_US
+
+J2000 = 2451545.0
+J2000_DATETIME = datetime(2000, 1, 1, 12, tzinfo=timezone.utc)
+KNOWN_NEW_MOON = 2451550.26
+SYNODIC_MONTH = 29.530588853
+
+
+def _datetime_from_julian(julian):
+    """Convert a Julian date to an aware UTC datetime."""
+    return (J2000_DATETIME + timedelta(days=julian - J2000)).replace(microsecond=0)
+
+
+@lru_cache(maxsize=8)
+def astronomical(latitude, longitude, day):
+    """
+    Return sunrise, sunset and moon phase for a location and date.
+
+    Uses the sunrise equation, accurate to about a minute. Sunrise and sunset
+    are None during polar day or night. The moon phase follows Dark Sky: 0 is
+    a new moon, 0.5 a full moon.
+    """
+    days = day.toordinal() - 730120
+    mean_solar_time = days - longitude / 360
+    anomaly = math.radians((357.5291 + 0.98560028 * mean_solar_time) % 360)
+    center = (
+        1.9148 * math.sin(anomaly)
+        + 0.02 * math.sin(2 * anomaly)
+        + 0.0003 * math.sin(3 * anomaly)
+    )
+    ecliptic = math.radians((math.degrees(anomaly) + center + 282.9372) % 360)
+    transit = (
+        J2000
+        + mean_solar_time
+        + 0.0053 * math.sin(anomaly)
+        - 0.0069 * math.sin(2 * ecliptic)
+    )
+    declination = math.asin(math.sin(ecliptic) * math.sin(math.radians(23.4397)))
+    cos_hour_angle = (
+        math.sin(math.radians(-0.833))
+        - math.sin(math.radians(latitude)) * math.sin(declination)
+    ) / (math.cos(math.radians(latitude)) * math.cos(declination))
+
+    sunrise = sunset = None
+    if -1 <= cos_hour_angle <= 1:
+        hour_angle = math.degrees(math.acos(cos_hour_angle)) / 360
+        sunrise = _datetime_from_julian(transit - hour_angle).isoformat()
+        sunset = _datetime_from_julian(transit + hour_angle).isoformat()
+
+    return {
+        "local_sunrise_time": sunrise,
+        "local_sunset_time": sunset,
+        "local_moon_phase": round(((transit - KNOWN_NEW_MOON) / SYNODIC_MONTH) % 1, 2),
+    }
+
+
+def _to_fahrenheit(temperature, unit_system):
+    """Convert a temperature to Fahrenheit."""
+    if unit_system == UNITS_US:
+        return temperature
+    return temperature * 9 / 5 + 32
+
+
+def _from_fahrenheit(temperature, unit_system):
+    """Convert a Fahrenheit temperature back to the unit system."""
+    if unit_system == UNITS_US:
+        return temperature
+    return (temperature - 32) * 5 / 9
+
+
+def _to_mph(speed, unit_system):
+    """Convert a wind speed to miles per hour."""
+    if unit_system in [UNITS_US, UNITS_UK2]:
+        return speed
+    if unit_system == UNITS_CA:
+        return speed / 1.609344
+    return speed * 2.236936
+
+
+def heat_index(temperature, humidity, unit_system):
+    """Return the NWS heat index, humidity as a 0-1 fraction."""
+    temp = _to_fahrenheit(temperature, unit_system)
+    rel = humidity * 100
+    index = 0.5 * (temp + 61 + (temp - 68) * 1.2 + rel * 0.094)
+    if index >= 80:
+        index = (
+            -42.379
+            + 2.04901523 * temp
+            + 10.14333127 * rel
+            - 0.22475541 * temp * rel
+            - 0.00683783 * temp * temp
+            - 0.05481717 * rel * rel
+            + 0.00122874 * temp * temp * rel
+            + 0.00085282 * temp * rel * rel
+            - 0.00000199 * temp * temp * rel * rel
+        )
+    return round(_from_fahrenheit(index, unit_system), 1)
+
+
+def wind_chill(temperature, wind_speed, unit_system):
+    """Return the NWS wind chill, or the temperature where it is undefined."""
+    temp = _to_fahrenheit(temperature, unit_system)
+    speed = _to_mph(wind_speed, unit_system)
+    if temp > 50 or speed < 3:
+        return round(temperature, 1)
+    chill = (
+        35.74 + 0.6215 * temp - 35.75 * speed ** 0.16 + 0.4275 * temp * speed ** 0.16
+    )
+    return round(_from_fahrenheit(chill, unit_system), 1)
+
+
+def frost_risk(temperature, dew_point, unit_system):
+    """Return a frost risk of none, low, medium or high."""
+    temp = (_to_fahrenheit(temperature, unit_system) - 32) * 5 / 9
+    dew = (_to_fahrenheit(dew_point, unit_system) - 32) * 5 / 9
+    if temp <= 0:
+        return "high"
+    if temp <= 3 and dew <= 0:
+        return "medium"
+    if temp <= 5:
+        return "low"
+    return "none"
+
+
+def derive_metrics(currently, unit_system):
+    """Compute all derived comfort metrics for one snapshot in a single pass."""
+    temperature = getattr(currently, "temperature", None)
+    humidity = getattr(currently, "humidity", None)
+    wind_speed = getattr(currently, "wind_speed", None)
+    dew_point = getattr(currently, "dew_point", None)
+
+    if temperature is None:
+        return {}
+
+    derived = {}
+    if humidity is not None:
+        derived["heat_index"] = heat_index(temperature, humidity, unit_system)
+    if wind_speed is not None:
+        derived["wind_chill"] = wind_chill(temperature, wind_speed, unit_system)
+    if dew_point is not None:
+        derived["frost_risk"] = frost_risk(temperature, dew_point, unit_system)
+    return derived
@@ -0,0 +1,46 @@
+"""Parse Dark Sky API responses outside of the event loop."""
+from darksky.forecast import Forecast  # pylint: disable=import-error
+
+from .derived import derive_metrics
+from .shared import format_daily_forecast, format_hourly_forecast
+
+try:
+    import orjson as json  # pylint: disable=import-error
+except ImportError:
+    import json
+
+
+def parse_forecast(raw):
+    """
+    Build a forecast snapshot from a raw API response body.
+
+    Runs in an executor: decoding, building the darksky model objects and
+    formatting the Home Assistant forecasts all happen here so only the
+    finished snapshot is handed back to the event loop.
+    """
+    res = Forecast(**json.loads(raw))
+    res.ha_daily_forecast = format_daily_forecast(res.daily.data)
+    res.ha_hourly_forecast = format_hourly_forecast(res.hourly.data)
+    res.units = res.flags.units
+    res.derived = derive_metrics(res.currently, res.units)
+    return res
+
+
+def parse_summaries(raw):
+    """
+    Extract only the summary text from a raw API response body.
+
+    The result mirrors where the summary sensors read their text: the
+    currently, hourly and daily summaries plus one summary per hourly and
+    daily data point.
+    """
+    data = json.loads(raw)
+    hourly = data.get("hourly", {})
+    daily = data.get("daily", {})
+    return {
+        "currently": data.get("currently", {}).get("summary"),
+        "hourly": hourly.get("summary"),
+        "daily": daily.get("summary"),
+        "hourly_data": [entry.get("summary") for entry in hourly.get("data", [])],
+        "daily_data": [entry.get("summary") for entry in daily.get("data", [])],
+    }
@@ -0,0 +1,77 @@
+"""Startup profiling and lazy loading of the Dark Sky integration modules."""
+from contextlib import contextmanager
+from functools import wraps
+import importlib
+import importlib.util
+import logging
+import sys
+from time import perf_counter
+
+from .const import DATA_PROFILER
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StartupProfiler:
+    """
+    Record how long imports and setup steps take.
+
+    Timings are only recorded when enabled, measuring is otherwise free of
+    side effects so the helpers can be used unconditionally.
+    """
+
+    def __init__(self, enabled=False):
+        """Initialize the profiler."""
+        self.enabled = enabled
+        self.timings = {}
+
+    @contextmanager
+    def measure(self, name):
+        """Record the duration of the wrapped block under name."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            if self.enabled:
+                self.timings[name] = self.timings.get(name, 0) + perf_counter() - start
+
+    def import_module(self, name):
+        """
+        Import a module of this integration on first use and time it.
+
+        Only the first, real import is recorded; later calls return the
+        module from sys.modules.
+        """
+        module = sys.modules.get(importlib.util.resolve_name(name, __package__))
+        if module is not None:
+            return module
+        with self.measure(f"import {name}"):
+            return importlib.import_module(name, __package__)
+
+    async def async_import_module(self, hass, name):
+        """Import a module like import_module, in the executor if not loaded."""
+        module = sys.modules.get(importlib.util.resolve_name(name, __package__))
+        if module is not None:
+            return module
+        return await hass.async_add_executor_job(self.import_module, name)
+
+    def log_report(self):
+        """Log the recorded timings, slowest first."""
+        for name, duration in sorted(
+            self.timings.items(), key=lambda item: item[1], reverse=True
+        ):
+            _LOGGER.info("Dark Sky startup: %s took %.3f seconds", name, duration)
+
+
+def profiled(name):
+    """Time a setup coroutine taking hass as its first argument."""
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(hass, *args, **kwargs):
+            with hass.data[DATA_PROFILER].measure(name):
+                return await func(hass, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,64 @@
+"""Chunked publishing of Dark Sky entity states."""
+import asyncio
+import logging
+from time import monotonic
+
+from homeassistant.core import callback
+
+from .const import PUBLISH_CHUNK_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PublishScheduler:
+    """
+    Spread entity state writes after a coordinator update over the event loop.
+
+    Entities register their write callback with a priority instead of
+    listening to the coordinator directly. On each update the callbacks run
+    in priority order, in chunks, yielding to the event loop between chunks.
+    """
+
+    def __init__(self, hass, coordinator, chunk_size=PUBLISH_CHUNK_SIZE):
+        """Initialize the scheduler and subscribe to the coordinator."""
+        self._hass = hass
+        self._chunk_size = chunk_size
+        self._listeners = {}
+        self._task = None
+        self.last_publish_duration = None
+        coordinator.async_add_listener(self._async_schedule)
+
+    @callback
+    def async_add_listener(self, update_callback, priority):
+        """Listen for data updates, lower priorities are published first."""
+        self._listeners[update_callback] = priority
+
+    @callback
+    def async_remove_listener(self, update_callback):
+        """Remove data update."""
+        self._listeners.pop(update_callback, None)
+
+    @callback
+    def _async_schedule(self):
+        """Start publishing, restarting if a previous publish is still running."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = self._hass.async_create_task(self._async_publish())
+
+    async def _async_publish(self):
+        """Run the listeners in priority order, one chunk per loop iteration."""
+        start = monotonic()
+        listeners = sorted(self._listeners, key=self._listeners.get)
+
+        for index in range(0, len(listeners), self._chunk_size):
+            for update_callback in listeners[index : index + self._chunk_size]:
+                if update_callback in self._listeners:
+                    update_callback()
+            await asyncio.sleep(0)
+
+        self.last_publish_duration = monotonic() - start
+        _LOGGER.debug(
+            "Published %d Dark Sky entities in %.3f seconds",
+            len(listeners),
+            self.last_publish_duration,
+        )
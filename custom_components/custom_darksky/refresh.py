@@ -0,0 +1,54 @@
+"""Single-flight, debounced refresh of the Dark Sky coordinator."""
+import asyncio
+from time import monotonic
+
+from homeassistant.core import callback
+
+from .const import REFRESH_DEBOUNCE
+
+
+class CoalescedRefresh:
+    """
+    Coalesce refresh requests into one coordinator refresh.
+
+    Requests arriving within the debounce window, or while a refresh is in
+    flight, all wait for the same refresh instead of starting their own.
+    """
+
+    def __init__(self, hass, coordinator, debounce=REFRESH_DEBOUNCE):
+        """Initialize the refresh."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._debounce = debounce
+        self._task = None
+        self._last_refresh = None
+        coordinator.async_add_listener(self._async_data_updated)
+
+    @callback
+    def _async_data_updated(self):
+        """Record when the coordinator last updated successfully."""
+        if self._coordinator.last_update_success:
+            self._last_refresh = monotonic()
+
+    async def async_refresh(self, max_age=None):
+        """
+        Refresh the coordinator data.
+
+        When max_age is given the refresh is skipped if the data is younger
+        than max_age seconds.
+        """
+        if (
+            max_age is not None
+            and self._last_refresh is not None
+            and monotonic() - self._last_refresh < max_age
+        ):
+            return
+
+        if self._task is None or self._task.done():
+            self._task = self._hass.async_create_task(self._async_refresh())
+        await asyncio.shield(self._task)
+
+    async def _async_refresh(self):
+        """Wait for the debounce window, then refresh once."""
+        await asyncio.sleep(self._debounce)
+        await self._coordinator.async_refresh()
@@ -0,0 +1,116 @@
+"""Latency budget and hedging for Dark Sky API requests."""
+import asyncio
+from collections import deque
+import logging
+from time import monotonic
+
+from aiohttp import ClientConnectionError, ClientResponseError
+
+from .const import (
+    HEDGE_DEFAULT_DELAY,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
+    LATENCY_WINDOW,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RequestPolicy:
+    """
+    Run a request within a latency budget, hedging slow requests.
+
+    If the request has not answered within the HEDGE_PERCENTILE latency of
+    recent requests, or failed with a connection or server error, a duplicate
+    is fired. Whichever answers first wins and the other is cancelled.
+    Latencies and hedge statistics are recorded so the hedge threshold follows
+    the observed latency.
+    """
+
+    def __init__(self, latency_budget):
+        """Initialize the policy."""
+        self._latency_budget = latency_budget
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.timeouts = 0
+
+    @property
+    def hedge_delay(self):
+        """Return how long to wait before firing a hedged request."""
+        if len(self._latencies) < HEDGE_MIN_SAMPLES:
+            delay = HEDGE_DEFAULT_DELAY
+        else:
+            latencies = sorted(self._latencies)
+            delay = latencies[int(HEDGE_PERCENTILE * (len(latencies) - 1))]
+        return min(delay, self._latency_budget)
+
+    @property
+    def stats(self):
+        """Return the recorded request statistics."""
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "timeouts": self.timeouts,
+            "hedge_delay": self.hedge_delay,
+        }
+
+    async def async_run(self, request, hedge=None):
+        """
+        Run request, hedged with hedge if given, and return the first result.
+
+        Both arguments are coroutine functions without arguments. Raises
+        asyncio.TimeoutError when nothing answered within the latency budget,
+        or the last error when all requests failed.
+        """
+        start = monotonic()
+        self.requests += 1
+        primary = asyncio.ensure_future(request())
+        hedged = None
+        pending = {primary}
+
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.hedge_delay)
+
+            if hedge is not None and (
+                not done or _is_retryable(primary.exception())
+            ):
+                self.hedges += 1
+                hedged = asyncio.ensure_future(hedge())
+                pending.add(hedged)
+
+            error = None
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        self._latencies.append(monotonic() - start)
+                        if task is hedged:
+                            self.hedge_wins += 1
+                            _LOGGER.debug("Hedged request won: %s", self.stats)
+                        return task.result()
+                    error = task.exception()
+
+                if not pending:
+                    raise error
+
+                remaining = self._latency_budget - (monotonic() - start)
+                if remaining > 0:
+                    done, pending = await asyncio.wait(
+                        pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                    )
+                if not done or remaining <= 0:
+                    self.timeouts += 1
+                    self._latencies.append(self._latency_budget)
+                    raise asyncio.TimeoutError
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+def _is_retryable(error):
+    """Return True if a failed request is worth hedging."""
+    if isinstance(error, ClientConnectionError):
+        return True
+    return isinstance(error, ClientResponseError) and error.status >= 500
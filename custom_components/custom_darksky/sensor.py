@@ -1,6 +1,7 @@
 """Support for Dark Sky weather service."""
 import voluptuous as vol
 import logging
+import weakref
 
 from homeassistant.components.sensor import PLATFORM_SCHEMA
 from homeassistant.const import (
@@ -10,23 +11,40 @@ from homeassistant.const import (
 )
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity
+import homeassistant.util.dt as dt_util
 
 from .const import (
+    DATA_DARKSKY,
+    DATA_PUBLISHER,
+    PUBLISH_PRIORITY_CURRENTLY,
+    PUBLISH_PRIORITY_FORECAST,
     DEFAULT_NAME,
     ATTRIBUTION,
     DOMAIN,
-    ICONS,
     CONF_FORECAST,
+    CONF_FORECAST_MATRIX,
     CONF_HOURLY_FORECAST,
+    CONF_LANGUAGE,
+    ATTR_DAILY,
+    ATTR_HOURLY,
+    LANGUAGES,
+)
+from .sensor_types import (
+    ICONS,
     DEPRECATED_SENSOR_TYPES,
+    DERIVED_SENSOR,
     CONDITION_PICTURES,
     CURRENTLY_SENSOR,
     DAILY_SENSOR,
     HOURLY_SENSOR,
     ALERTS_ATTRS,
+    ASTRONOMICAL_SENSOR,
     SENSOR_LABELS,
+    SUMMARY_SENSOR,
 )
-from .shared import unit_of_measurement, xstr
+from .derived import astronomical
+from .profiling import profiled
+from .shared import format_state_value, forecast_series, unit_of_measurement, xstr
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,10 +58,13 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
         vol.Optional(CONF_HOURLY_FORECAST): vol.All(
             cv.ensure_list, [vol.Range(min=0, max=48)]
         ),
+        vol.Optional(CONF_FORECAST_MATRIX, default=False): cv.boolean,
+        vol.Optional(CONF_LANGUAGE): vol.In(LANGUAGES),
     }
 )
 
 
+@profiled("sensor platform")
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     """Set up the Dark Sky weather platform."""
     data = hass.data[DOMAIN]
@@ -52,8 +73,22 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
 
     forecast = config[CONF_FORECAST]
     forecast_hour = config[CONF_HOURLY_FORECAST]
+    language = config.get(CONF_LANGUAGE)
+    darksky = hass.data[DATA_DARKSKY]
     sensors = []
 
+    if language == darksky.language:
+        language = None
+
+    if language is not None and set(config[CONF_MONITORED_CONDITIONS]) & set(
+        SUMMARY_SENSOR
+    ):
+        if darksky.add_summary_language(language):
+            # Only fetch the new language's summaries, not the whole forecast
+            await darksky.async_update_summaries()
+            if data.data is not None:
+                data.data.summaries = darksky.summaries
+
     for variable in config[CONF_MONITORED_CONDITIONS]:
 
         if variable in DEPRECATED_SENSOR_TYPES:
@@ -61,20 +96,40 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
 
         if variable == "alerts":
             sensors.append(DarkSkyAlertSensor(data, variable, name))
+        elif variable in ASTRONOMICAL_SENSOR or variable in DERIVED_SENSOR:
+            sensors.append(DarkSkyLocalSensor(data, variable, name, darksky))
+        elif config[CONF_FORECAST_MATRIX] and (
+            variable in HOURLY_SENSOR or variable in DAILY_SENSOR
+        ):
+            sensors.append(
+                DarkSkyMatrixSensor(data, variable, name, language=language)
+            )
         else:
             if variable in CURRENTLY_SENSOR:
-                sensors.append(DarkSkySensor(data, variable, name))
+                sensors.append(DarkSkySensor(data, variable, name, language=language))
 
             if forecast is not None and variable in DAILY_SENSOR:
                 for forecast_day in forecast:
                     sensors.append(
-                        DarkSkySensor(data, variable, name, forecast_day=forecast_day)
+                        DarkSkySensor(
+                            data,
+                            variable,
+                            name,
+                            forecast_day=forecast_day,
+                            language=language,
+                        )
                     )
 
             if forecast_hour is not None and variable in HOURLY_SENSOR:
                 for forecast_h in forecast_hour:
                     sensors.append(
-                        DarkSkySensor(data, variable, name, forecast_hour=forecast_h)
+                        DarkSkySensor(
+                            data,
+                            variable,
+                            name,
+                            forecast_hour=forecast_h,
+                            language=language,
+                        )
                     )
     async_add_entities(sensors, True)
 
@@ -83,7 +138,13 @@ class DarkSkySensor(Entity):
     """Implementation of a Dark Sky sensor."""
 
     def __init__(
-        self, coordinator, sensor_type, name, forecast_day=None, forecast_hour=None
+        self,
+        coordinator,
+        sensor_type,
+        name,
+        forecast_day=None,
+        forecast_hour=None,
+        language=None,
     ):
         """Initialize the sensor."""
         self.client_name = name
@@ -92,6 +153,7 @@ class DarkSkySensor(Entity):
         self.type = sensor_type
         self.forecast_day = forecast_day
         self.forecast_hour = forecast_hour
+        self._language = language
         self._state = None
         self._icon = None
         self._unit_of_measurement = None
@@ -103,45 +165,74 @@ class DarkSkySensor(Entity):
 
         If the sensor type is unknown, the current state is returned.
         """
-        state = getattr(data, self.type, None)
-
-        if state is None:
-            return state
-
-        # Some state data needs to be rounded to whole values or converted to
-        # percentages
-        if self.type in ["precip_probability", "cloud_cover", "humidity"]:
-            return round(state * 100, 1)
-
-        if self.type in [
-            "dew_point",
-            "temperature",
-            "apparent_temperature",
-            "temperature_low",
-            "apparent_temperature_low",
-            "temperature_min",
-            "apparent_temperature_min",
-            "temperature_high",
-            "apparent_temperature_high",
-            "temperature_max",
-            "apparent_temperature_max",
-            "precip_accumulation",
-            "pressure",
-            "ozone",
-            "uvIndex",
-        ]:
-            return round(state, 1)
-        return state
+        return format_state_value(self.type, getattr(data, self.type, None))
+
+    def get_translated_summary(self, key, index=None):
+        """Return summary text fetched in the entity language, if available."""
+        summaries = getattr(self._coordinator.data, "summaries", {}).get(
+            self._language
+        )
+        if summaries is None:
+            return None
+        if index is None:
+            return summaries[key]
+        try:
+            return summaries[key][index]
+        except IndexError:
+            return None
+
+    def translated_summary(self):
+        """
+        Return the summary of this sensor in the entity language.
+
+        Returns None until the language has been fetched, the state then
+        falls back to the summary in the main language.
+        """
+        if self.type == "hourly_summary":
+            return self.get_translated_summary("hourly_data", 0)
+        if self.type == "daily_summary":
+            return self.get_translated_summary("daily_data", 0)
+        if self.type == "summary" and self.forecast_hour is not None:
+            return self.get_translated_summary("hourly_data", self.forecast_hour)
+        if self.type == "summary" and self.forecast_day is not None:
+            return self.get_translated_summary("daily_data", self.forecast_day)
+        return self.get_translated_summary("currently")
 
     def rebind_data(self):
-        """Rebind data returned in DataUpdateCoordinator."""
-        self._currently = self._coordinator.data.currently
-        self._hourly = self._coordinator.data.hourly
-        self._daily = self._coordinator.data.daily
+        """
+        Rebind data returned in DataUpdateCoordinator.
+
+        Only a weak reference to the snapshot is kept so old snapshots are not
+        pinned in memory by the entity.
+        """
+        self._snapshot = weakref.ref(self._coordinator.data)
         self._units = self._coordinator.data.flags.units
-        self._flags = self._coordinator.data.flags
         self.update_unit_of_measurement()
 
+    @property
+    def _data(self):
+        """Return the bound snapshot, rebinding if it was released."""
+        data = self._snapshot()
+        if data is None:
+            self.rebind_data()
+            data = self._coordinator.data
+        return data
+
+    @property
+    def _currently(self):
+        """Return the currently block of the bound snapshot."""
+        return self._data.currently
+
+    @property
+    def _hourly(self):
+        """Return the hourly block of the bound snapshot."""
+        return self._data.hourly
+
+    @property
+    def _daily(self):
+        """Return the daily block of the bound snapshot."""
+        return self._data.daily
+
     def update_unit_of_measurement(self):
         """Update units based on unit system."""
         if self._units is not None:
@@ -172,7 +263,13 @@ class DarkSkySensor(Entity):
         """Return the state of the sensor."""
         self.rebind_data()
 
-        if self.type == "minutely_summary":
+        translated = None
+        if self._language is not None and self.type in SUMMARY_SENSOR:
+            translated = self.translated_summary()
+
+        if translated is not None:
+            self._state = translated
+        elif self.type == "minutely_summary":
             self._state = xstr(self._currently.summary)
         elif self.type == "hourly_summary":
             self._state = xstr(self._hourly.data[0].summary)
@@ -221,6 +318,15 @@ class DarkSkySensor(Entity):
         """Return False, updates are controlled via coordinator."""
         return False
 
+    @property
+    def publish_priority(self):
+        """Return the publish priority, far-horizon forecasts come last."""
+        if self.forecast_hour is not None:
+            return PUBLISH_PRIORITY_FORECAST + self.forecast_hour
+        if self.forecast_day is not None:
+            return PUBLISH_PRIORITY_FORECAST + 24 * self.forecast_day
+        return PUBLISH_PRIORITY_CURRENTLY
+
     @property
     def icon(self):
         """Icon to use in the frontend, if any."""
@@ -241,11 +347,153 @@ class DarkSkySensor(Entity):
 
     async def async_added_to_hass(self):
         """Subscribe to updates."""
-        self._coordinator.async_add_listener(self.async_write_ha_state)
+        self.hass.data[DATA_PUBLISHER].async_add_listener(
+            self.async_write_ha_state, self.publish_priority
+        )
+
+    async def async_will_remove_from_hass(self):
+        """Undo subscription."""
+        self.hass.data[DATA_PUBLISHER].async_remove_listener(self.async_write_ha_state)
+
+
+class DarkSkyMatrixSensor(DarkSkySensor):
+    """
+    Dark Sky sensor exposing a whole forecast series.
+
+    Replaces one entity per forecast offset with a single entity per monitored
+    condition that has an hourly or daily series. The state is the same as the
+    non-forecast sensor of the condition (or today's value for daily-only
+    conditions) and the series are exposed as compact attributes.
+    """
+
+    @property
+    def name(self):
+        """Return the name of the sensor."""
+        return f"{self.client_name} {self._name} Forecast"
+
+    @property
+    def state(self):
+        """Return the state of the sensor."""
+        self.rebind_data()
+
+        if self.type in CURRENTLY_SENSOR:
+            return super().state
+
+        if self._daily is not None and self._daily.data:
+            self._state = self.get_state(self._daily.data[0])
+        else:
+            self._state = None
+
+        return self._state
+
+    @property
+    def publish_priority(self):
+        """Return the publish priority."""
+        return PUBLISH_PRIORITY_FORECAST
+
+    def series(self, block, summaries_key):
+        """
+        Return the series of one block.
+
+        Summaries are taken from the text fetched in the entity language,
+        falling back to the main language for entries without a translation.
+        """
+        series = forecast_series(block, self.type)
+        if series is None or self.type != "summary" or self._language is None:
+            return series
+
+        translated = self.get_translated_summary(summaries_key) or []
+        series["values"] = [
+            translated[index]
+            if index < len(translated) and translated[index] is not None
+            else value
+            for index, value in enumerate(series["values"])
+        ]
+        return series
+
+    @property
+    def device_state_attributes(self):
+        """Return the state attributes."""
+        attrs = {ATTR_ATTRIBUTION: ATTRIBUTION}
+        if self.type in HOURLY_SENSOR:
+            attrs[ATTR_HOURLY] = self.series(self._hourly, "hourly_data")
+        if self.type in DAILY_SENSOR:
+            attrs[ATTR_DAILY] = self.series(self._daily, "daily_data")
+        return attrs
+
+
+class DarkSkyLocalSensor(Entity):
+    """
+    Dark Sky sensor computed locally.
+
+    Astronomical values are computed from the configured location and do not
+    depend on API refreshes. Derived comfort metrics are computed once per
+    snapshot while it is parsed.
+    """
+
+    def __init__(self, coordinator, sensor_type, name, darksky):
+        """Initialize the sensor."""
+        self.client_name = name
+        self._name = SENSOR_LABELS[sensor_type]
+        self._coordinator = coordinator
+        self._latitude = darksky.latitude
+        self._longitude = darksky.longitude
+        self.type = sensor_type
+        self._state = None
+
+    @property
+    def name(self):
+        """Return the name of the sensor."""
+        return f"{self.client_name} {self._name}"
+
+    @property
+    def state(self):
+        """Return the state of the sensor."""
+        if self.type in ASTRONOMICAL_SENSOR:
+            values = astronomical(self._latitude, self._longitude, dt_util.now().date())
+        else:
+            values = getattr(self._coordinator.data, "derived", {})
+        self._state = values.get(self.type)
+        return self._state
+
+    @property
+    def unit_of_measurement(self):
+        """Return the unit of measurement of this entity, if any."""
+        if self.type in DERIVED_SENSOR:
+            return unit_of_measurement(self.type, self._coordinator.data.units)
+        return None
+
+    @property
+    def should_poll(self):
+        """Return False, updates are controlled via coordinator."""
+        return False
+
+    @property
+    def icon(self):
+        """Icon to use in the frontend, if any."""
+        return ICONS.get(self.type)
+
+    @property
+    def publish_priority(self):
+        """Return the publish priority."""
+        return PUBLISH_PRIORITY_CURRENTLY
+
+    @property
+    def device_state_attributes(self):
+        """Return the state attributes."""
+        if self.type in ASTRONOMICAL_SENSOR:
+            return None
+        return {ATTR_ATTRIBUTION: ATTRIBUTION}
+
+    async def async_added_to_hass(self):
+        """Subscribe to updates."""
+        self.hass.data[DATA_PUBLISHER].async_add_listener(
+            self.async_write_ha_state, self.publish_priority
+        )
 
     async def async_will_remove_from_hass(self):
         """Undo subscription."""
-        self._coordinator.async_remove_listener(self.async_write_ha_state)
+        self.hass.data[DATA_PUBLISHER].async_remove_listener(self.async_write_ha_state)
 
 
 class DarkSkyAlertSensor(Entity):
@@ -259,7 +507,7 @@ class DarkSkyAlertSensor(Entity):
         self.type = sensor_type
         self._state = None
         self._icon = None
-        self._alerts = coordinator.data.alerts
+        self._alerts = {}
 
     def get_state(self, data):
         """
@@ -292,7 +540,7 @@ class DarkSkyAlertSensor(Entity):
     @property
     def state(self):
         """Return the state of the sensor."""
-        self._state = self.get_state(self._alerts)
+        self._state = self.get_state(self._coordinator.data.alerts)
         return self._state
 
     @property
@@ -302,6 +550,11 @@ class DarkSkyAlertSensor(Entity):
             return "mdi:alert-circle"
         return "mdi:alert-circle-outline"
 
+    @property
+    def publish_priority(self):
+        """Return the publish priority."""
+        return PUBLISH_PRIORITY_CURRENTLY
+
     @property
     def device_state_attributes(self):
         """Return the state attributes."""
@@ -309,8 +562,10 @@ class DarkSkyAlertSensor(Entity):
 
     async def async_added_to_hass(self):
         """Subscribe to updates."""
-        self._coordinator.async_add_listener(self.async_write_ha_state)
+        self.hass.data[DATA_PUBLISHER].async_add_listener(
+            self.async_write_ha_state, self.publish_priority
+        )
 
     async def async_will_remove_from_hass(self):
         """Undo subscription."""
-        self._coordinator.async_remove_listener(self.async_write_ha_state)
+        self.hass.data[DATA_PUBLISHER].async_remove_listener(self.async_write_ha_state)
@@ -1,3 +1,4 @@
+import homeassistant.util.dt as dt_util
 from homeassistant.util.pressure import convert as convert_pressure
 from homeassistant.components.weather import (
     ATTR_FORECAST_CONDITION,
@@ -7,30 +8,26 @@ from homeassistant.components.weather import (
     ATTR_FORECAST_TIME,
     ATTR_FORECAST_WIND_BEARING,
     ATTR_FORECAST_WIND_SPEED,
-    PLATFORM_SCHEMA,
-    WeatherEntity,
 )
 
 from .const import (
-    DEFAULT_NAME,
-    DEFAULT_MODE,
-    DOMAIN,
-    FORECAST_MODE,
-    ATTRIBUTION,
     MAP_CONDITION,
+    UNITS_CA,
+    UNITS_UK2,
+    UNITS_US,
 )
 
 from homeassistant.const import (
-    CONF_MODE,
-    CONF_NAME,
     PRESSURE_HPA,
     PRESSURE_INHG,
-    TEMP_CELSIUS,
-    TEMP_FAHRENHEIT,
+    SPEED_KILOMETERS_PER_HOUR,
+    SPEED_METERS_PER_SECOND,
+    SPEED_MILES_PER_HOUR,
+    TIME_HOURS,
+    UNIT_PERCENTAGE,
+    UNIT_UV_INDEX,
 )
 
-from darksky.types import units
-
 
 def xstr(s):
     """
@@ -44,9 +41,9 @@ def xstr(s):
 def unit_of_measurement(sensor_type, unit_type):
     """Return unit of a given measurement for unit type."""
     if sensor_type in ["nearest_storm_distance", "visibility"]:
-        return "mi" if unit_type in [units.US, units.UK2] else "km"
+        return "mi" if unit_type in [UNITS_US, UNITS_UK2] else "km"
     elif sensor_type in ["precip_intensity", "precip_intensity_max"]:
-        return "in" if unit_type == units.US else f"mm/{TIME_HOURS}"
+        return "in" if unit_type == UNITS_US else f"mm/{TIME_HOURS}"
     elif sensor_type in [
         "temperature",
         "apparent_temperature",
@@ -59,12 +56,14 @@ def unit_of_measurement(sensor_type, unit_type):
         "temperature_high",
         "temperature_min",
         "temperature_low",
+        "heat_index",
+        "wind_chill",
     ]:
-        return "°F" if unit_type == units.US else "°C"
+        return "°F" if unit_type == UNITS_US else "°C"
     elif sensor_type in ["wind_speed", "wind_gust"]:
-        if unit_type in [units.US, units.UK2]:
+        if unit_type in [UNITS_US, UNITS_UK2]:
             return SPEED_MILES_PER_HOUR
-        elif unit_type == units.CA:
+        elif unit_type == UNITS_CA:
             return SPEED_KILOMETERS_PER_HOUR
         else:
             return SPEED_METERS_PER_SECOND
@@ -77,7 +76,7 @@ def unit_of_measurement(sensor_type, unit_type):
     elif sensor_type == "uv_index":
         return UNIT_UV_INDEX
     elif sensor_type == "precip_accumulation":
-        return "in" if unit_type == units.US else "cm"
+        return "in" if unit_type == UNITS_US else "cm"
     elif sensor_type in ["nearest_storm_bearing", "wind_bearing"]:
         return "°"
     else:
@@ -124,3 +123,87 @@ def format_hourly_forecast(data):
         }
         for entry in data
     ]
+
+
+def format_state_value(sensor_type, state):
+    """Round or convert a raw Dark Sky value for the given sensor type."""
+    if state is None:
+        return state
+
+    # Some state data needs to be rounded to whole values or converted to
+    # percentages
+    if sensor_type in ["precip_probability", "cloud_cover", "humidity"]:
+        return round(state * 100, 1)
+
+    if sensor_type in [
+        "dew_point",
+        "temperature",
+        "apparent_temperature",
+        "temperature_low",
+        "apparent_temperature_low",
+        "temperature_min",
+        "apparent_temperature_min",
+        "temperature_high",
+        "apparent_temperature_high",
+        "temperature_max",
+        "apparent_temperature_max",
+        "precip_accumulation",
+        "pressure",
+        "ozone",
+        "uvIndex",
+    ]:
+        return round(state, 1)
+    return state
+
+
+def forecast_series(block, sensor_type, start=0, end=None):
+    """
+    Return a compact series of values for one sensor type.
+
+    The series is a dict holding the time of the first entry and a flat list
+    of values, one per data point of the hourly or daily block.
+    """
+    if block is None or not block.data:
+        return None
+
+    entries = block.data[start:end]
+    if not entries:
+        return None
+
+    return {
+        "start": entries[0].time.isoformat(),
+        "values": [
+            format_state_value(sensor_type, getattr(entry, sensor_type, None))
+            for entry in entries
+        ],
+    }
+
+
+def filter_forecast(forecast, start=None, end=None, fields=None):
+    """
+    Return the forecast entries between start and end.
+
+    Entries are kept when start <= time < end. When fields is given only those
+    keys (plus the time) are kept in each entry.
+    """
+    if forecast is None:
+        return []
+
+    start = dt_util.as_utc(start) if start is not None else None
+    end = dt_util.as_utc(end) if end is not None else None
+
+    result = []
+    for entry in forecast:
+        entry_time = dt_util.as_utc(dt_util.parse_datetime(entry[ATTR_FORECAST_TIME]))
+        if start is not None and entry_time < start:
+            continue
+        if end is not None and entry_time >= end:
+            continue
+        if fields:
+            entry = {
+                key: value
+                for key, value in entry.items()
+                if key == ATTR_FORECAST_TIME or key in fields
+            }
+        result.append(entry)
+    return result
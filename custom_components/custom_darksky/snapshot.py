@@ -0,0 +1,40 @@
+"""Lifecycle management of Dark Sky forecast snapshots."""
+from collections import deque
+import weakref
+
+from .const import SNAPSHOT_HISTORY_SIZE
+
+
+class SnapshotHistory:
+    """
+    Number forecast snapshots and bound how many of them are kept alive.
+
+    Every snapshot gets an increasing generation number. Only the last
+    max_retained snapshots are referenced strongly; entities are expected to
+    hold weak references, so older snapshots are released as soon as they
+    fall out of the history. Snapshots that are still alive beyond that point
+    are pinned by someone else and show up in live_generations.
+    """
+
+    def __init__(self, max_retained=SNAPSHOT_HISTORY_SIZE):
+        """Initialize the history."""
+        self._generation = 0
+        self._retained = deque(maxlen=max_retained)
+        self._live = weakref.WeakValueDictionary()
+
+    @property
+    def generation(self):
+        """Return the generation of the latest snapshot."""
+        return self._generation
+
+    def add(self, snapshot):
+        """Assign the next generation to a snapshot and retain it."""
+        self._generation += 1
+        snapshot.generation = self._generation
+        self._retained.append(snapshot)
+        self._live[self._generation] = snapshot
+        return snapshot
+
+    def live_generations(self):
+        """Return the generations of all snapshots still in memory."""
+        return sorted(self._live.keys())
@@ -1,7 +1,6 @@
 """Support for displaying weather info from Dark Sky API."""
 import voluptuous as vol
 import logging
-from darksky.types import units  # pylint: disable=import-error
 
 import homeassistant.helpers.config_validation as cv
 from homeassistant.components.weather import (
@@ -16,13 +15,18 @@ from homeassistant.const import (
 )
 
 from .const import (
+    DATA_PUBLISHER,
+    PUBLISH_PRIORITY_CURRENTLY,
+    CONF_FORECAST_LIMIT,
     DEFAULT_NAME,
     DEFAULT_MODE,
     DOMAIN,
     FORECAST_MODE,
     ATTRIBUTION,
     MAP_CONDITION,
+    UNITS_US,
 )
+from .profiling import profiled
 from .shared import imperial_pressure
 
 _LOGGER = logging.getLogger(__name__)
@@ -31,31 +35,43 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
     {
         vol.Optional(CONF_MODE, default=DEFAULT_MODE): vol.In(FORECAST_MODE),
         vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
+        vol.Optional(CONF_FORECAST_LIMIT): vol.All(vol.Coerce(int), vol.Range(min=0)),
     }
 )
 
 
+@profiled("weather platform")
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     """Set up the Dark Sky weather platform."""
     coordinator = hass.data[DOMAIN]
     mode = config[CONF_MODE]
-    async_add_entities([DarkSkyWeather(coordinator, mode)], True)
+    forecast_limit = config.get(CONF_FORECAST_LIMIT)
+    async_add_entities([DarkSkyWeather(coordinator, mode, forecast_limit)], True)
     return True
 
 
 class DarkSkyWeather(WeatherEntity):
     """Representation of an weather sensor."""
 
-    def __init__(self, coordinator, mode):
+    def __init__(self, coordinator, mode, forecast_limit=None):
         """Initialize Dark Sky weather."""
 
         _LOGGER.debug("Initializing DarkSky Weather sensor")
 
         self._name = DEFAULT_NAME
         self._mode = mode
+        self._forecast_limit = forecast_limit
         self._coordinator = coordinator
-        self._currently = coordinator.data.currently
-        self._units = coordinator.data.units
+
+    @property
+    def _currently(self):
+        """Return the currently block of the latest snapshot."""
+        return self._coordinator.data.currently
+
+    @property
+    def _units(self):
+        """Return the unit system of the latest snapshot."""
+        return self._coordinator.data.units
 
     @property
     def available(self):
@@ -80,7 +96,7 @@ class DarkSkyWeather(WeatherEntity):
     @property
     def temperature_unit(self):
         """Return the unit of measurement."""
-        if self._units == units.US:
+        if self._units == UNITS_US:
             return TEMP_FAHRENHEIT
         return TEMP_CELSIUS
 
@@ -108,7 +124,7 @@ class DarkSkyWeather(WeatherEntity):
     @property
     def pressure(self):
         """Return the pressure."""
-        if self._units == units.US:
+        if self._units == UNITS_US:
             return imperial_pressure(self._currently.pressure)
         return self._currently.pressure
 
@@ -127,6 +143,11 @@ class DarkSkyWeather(WeatherEntity):
         """Return False, updates are controlled via coordinator."""
         return False
 
+    @property
+    def publish_priority(self):
+        """Return the publish priority."""
+        return PUBLISH_PRIORITY_CURRENTLY
+
     @property
     def unique_id(self):
         """Return unique ID."""
@@ -134,18 +155,32 @@ class DarkSkyWeather(WeatherEntity):
 
     @property
     def forecast(self):
-        """Return the forecast array."""
+        """
+        Return the forecast array.
+
+        The array is truncated to forecast_limit entries, or dropped when the
+        limit is 0. The full forecast stays available through the websocket API.
+        """
+        if self._forecast_limit == 0:
+            return None
+
         if self._mode == "hourly":
-            return self._coordinator.data.ha_hourly_forecast
-        if self._mode == "daily":
-            return self._coordinator.data.ha_daily_forecast
+            forecast = self._coordinator.data.ha_hourly_forecast
+        elif self._mode == "daily":
+            forecast = self._coordinator.data.ha_daily_forecast
+        else:
+            return None
 
-        return None
+        if self._forecast_limit is not None:
+            return forecast[: self._forecast_limit]
+        return forecast
 
     async def async_added_to_hass(self):
         """Subscribe to updates."""
-        self._coordinator.async_add_listener(self.async_write_ha_state)
+        self.hass.data[DATA_PUBLISHER].async_add_listener(
+            self.async_write_ha_state, self.publish_priority
+        )
 
     async def async_will_remove_from_hass(self):
         """Undo subscription."""
-        self._coordinator.async_remove_listener(self.async_write_ha_state)
+        self.hass.data[DATA_PUBLISHER].async_remove_listener(self.async_write_ha_state)
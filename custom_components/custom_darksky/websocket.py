@@ -0,0 +1,106 @@
+"""Websocket API for querying cached Dark Sky forecast data."""
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.components.weather import (
+    ATTR_FORECAST_CONDITION,
+    ATTR_FORECAST_PRECIPITATION,
+    ATTR_FORECAST_TEMP,
+    ATTR_FORECAST_TEMP_LOW,
+    ATTR_FORECAST_WIND_BEARING,
+    ATTR_FORECAST_WIND_SPEED,
+)
+from homeassistant.components.websocket_api.const import ERR_NOT_FOUND
+from homeassistant.core import callback
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    ATTR_DAILY,
+    ATTR_HOURLY,
+    DATA_PROFILER,
+    DOMAIN,
+    FORECAST_MODE,
+    WS_TYPE_FORECAST,
+    WS_TYPE_FORECAST_MATRIX,
+)
+from .shared import filter_forecast, forecast_series
+
+FORECAST_FIELDS = [
+    ATTR_FORECAST_CONDITION,
+    ATTR_FORECAST_PRECIPITATION,
+    ATTR_FORECAST_TEMP,
+    ATTR_FORECAST_TEMP_LOW,
+    ATTR_FORECAST_WIND_BEARING,
+    ATTR_FORECAST_WIND_SPEED,
+]
+
+
+@callback
+def async_setup_websocket(hass):
+    """Register the Dark Sky websocket commands."""
+    websocket_api.async_register_command(hass, websocket_forecast)
+    websocket_api.async_register_command(hass, websocket_forecast_matrix)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_FORECAST,
+        vol.Optional("mode", default=ATTR_HOURLY): vol.In(FORECAST_MODE),
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("fields"): vol.All(cv.ensure_list, [vol.In(FORECAST_FIELDS)]),
+    }
+)
+@callback
+def websocket_forecast(hass, connection, msg):
+    """Return a slice of the cached weather forecast."""
+    data = hass.data[DOMAIN].data
+    if data is None:
+        connection.send_error(msg["id"], ERR_NOT_FOUND, "No forecast available")
+        return
+
+    if msg["mode"] == ATTR_DAILY:
+        forecast = data.ha_daily_forecast
+    else:
+        forecast = data.ha_hourly_forecast
+
+    connection.send_result(
+        msg["id"],
+        filter_forecast(forecast, msg.get("start"), msg.get("end"), msg.get("fields")),
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_FORECAST_MATRIX,
+        vol.Required("condition"): cv.string,
+        vol.Optional("mode", default=ATTR_HOURLY): vol.In([ATTR_HOURLY, ATTR_DAILY]),
+        vol.Optional("start", default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional("end"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    }
+)
+@websocket_api.async_response
+async def websocket_forecast_matrix(hass, connection, msg):
+    """Return a slice of the cached forecast series for one condition."""
+    data = hass.data[DOMAIN].data
+    condition = msg["condition"]
+    mode = msg["mode"]
+    sensor_types = await hass.data[DATA_PROFILER].async_import_module(
+        hass, ".sensor_types"
+    )
+
+    if mode == ATTR_HOURLY and condition in sensor_types.HOURLY_SENSOR:
+        block = data.hourly if data is not None else None
+    elif mode == ATTR_DAILY and condition in sensor_types.DAILY_SENSOR:
+        block = data.daily if data is not None else None
+    else:
+        block = None
+
+    series = forecast_series(block, condition, msg["start"], msg.get("end"))
+    if series is None:
+        connection.send_error(
+            msg["id"], ERR_NOT_FOUND, f"No {mode} forecast for {condition}"
+        )
+        return
+
+    connection.send_result(msg["id"], series)
@@ -0,0 +1,228 @@
+"""
+Offline soak test for the Dark Sky refresh pipeline.
+
+Runs thousands of simulated refreshes of DarkSkyData against a fake API and
+checks that memory stays flat and that old snapshots are released once they
+fall out of the retained history. Real sensor, alert and weather entities
+are built against a stub coordinator and read after every refresh, so
+snapshots pinned by entities are caught as well.
+
+    python scripts/soak.py --refreshes 5000
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Allow running the script directly from the repository root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from homeassistant.const import CONF_API_KEY  # noqa: E402
+
+from custom_components.custom_darksky import DarkSkyData  # noqa: E402
+from custom_components.custom_darksky.const import (  # noqa: E402
+    CONF_LANGUAGE,
+    CONF_LATENCY_BUDGET,
+    DATA_PROFILER,
+    DEFAULT_LATENCY_BUDGET,
+    DOMAIN,
+    SNAPSHOT_HISTORY_SIZE,
+)
+from custom_components.custom_darksky.profiling import (  # noqa: E402
+    StartupProfiler,
+)
+from custom_components.custom_darksky.sensor import (  # noqa: E402
+    DarkSkyAlertSensor,
+    DarkSkySensor,
+)
+from custom_components.custom_darksky.weather import DarkSkyWeather  # noqa: E402
+
+ICONS = ["clear-day", "cloudy", "rain", "snow", "fog"]
+
+
+def fake_point(timestamp, index):
+    """Return one fake data point."""
+    return {
+        "time": timestamp,
+        "summary": f"Summary {index}",
+        "icon": ICONS[index % len(ICONS)],
+        "temperature": 10.0 + index % 7,
+        "temperatureHigh": 15.0 + index % 5,
+        "temperatureLow": 5.0 + index % 3,
+        "apparentTemperature": 9.0 + index % 7,
+        "dewPoint": 4.0,
+        "humidity": 0.6,
+        "pressure": 1013.2,
+        "windSpeed": 3.4,
+        "windBearing": 270,
+        "cloudCover": 0.4,
+        "precipIntensity": 0.1 * (index % 3),
+        "precipProbability": 0.2,
+        "uvIndex": 3,
+        "visibility": 16.0,
+        "ozone": 300.0,
+    }
+
+
+def fake_payload(refresh):
+    """Return a fake API response body that differs on every refresh."""
+    now = int(time.time()) + refresh
+    return json.dumps(
+        {
+            "latitude": 52.37,
+            "longitude": 4.89,
+            "timezone": "Europe/Amsterdam",
+            "offset": 1,
+            "currently": fake_point(now, refresh),
+            "hourly": {
+                "summary": f"Hourly {refresh}",
+                "icon": "cloudy",
+                "data": [fake_point(now + 3600 * i, refresh + i) for i in range(49)],
+            },
+            "daily": {
+                "summary": f"Daily {refresh}",
+                "icon": "rain",
+                "data": [fake_point(now + 86400 * i, refresh + i) for i in range(8)],
+            },
+            "alerts": [],
+            "flags": {"units": "si"},
+        }
+    ).encode()
+
+
+class FakeResponse:
+    """Fake aiohttp response."""
+
+    def __init__(self, body):
+        """Initialize the response."""
+        self._body = body
+
+    async def __aenter__(self):
+        """Enter the response context."""
+        return self
+
+    async def __aexit__(self, *args):
+        """Exit the response context."""
+
+    def raise_for_status(self):
+        """Never fail."""
+
+    async def read(self):
+        """Return the body."""
+        return self._body
+
+
+class FakeSession:
+    """Fake aiohttp session serving a new forecast on every request."""
+
+    def __init__(self):
+        """Initialize the session."""
+        self.requests = 0
+
+    def get(self, url, params=None):
+        """Return a fake response."""
+        self.requests += 1
+        return FakeResponse(fake_payload(self.requests))
+
+
+async def async_soak(refreshes, warmup, max_growth):
+    """Run the soak test and return True if memory stayed flat."""
+    loop = asyncio.get_running_loop()
+    hass = SimpleNamespace(
+        data={DATA_PROFILER: StartupProfiler()},
+        config=SimpleNamespace(
+            latitude=52.37, longitude=4.89, units=SimpleNamespace(is_metric=True)
+        ),
+        async_add_executor_job=lambda target, *args: loop.run_in_executor(
+            None, target, *args
+        ),
+    )
+    config = {
+        DOMAIN: {
+            CONF_API_KEY: "soak",
+            CONF_LANGUAGE: "en",
+            CONF_LATENCY_BUDGET: DEFAULT_LATENCY_BUDGET,
+        }
+    }
+
+    with patch(
+        "custom_components.custom_darksky.async_get_clientsession",
+        return_value=FakeSession(),
+    ):
+        darksky = DarkSkyData(hass, config)
+    await darksky.async_setup()
+
+    # The coordinator is the only intended strong reference to the latest data.
+    coordinator = SimpleNamespace(
+        data=await darksky.async_request_refresh(), last_update_success=True
+    )
+    entities = [
+        DarkSkySensor(coordinator, "temperature", "Soak"),
+        DarkSkySensor(coordinator, "summary", "Soak"),
+        DarkSkySensor(coordinator, "temperature", "Soak", forecast_hour=24),
+        DarkSkySensor(coordinator, "temperature_high", "Soak", forecast_day=3),
+        DarkSkyAlertSensor(coordinator, "alerts", "Soak"),
+    ]
+    weather = DarkSkyWeather(coordinator, "hourly")
+
+    tracemalloc.start()
+    for refresh in range(warmup + refreshes):
+        coordinator.data = await darksky.async_request_refresh()
+        for entity in entities:
+            entity.state  # pylint: disable=pointless-statement
+        weather.temperature  # pylint: disable=pointless-statement
+        weather.forecast  # pylint: disable=pointless-statement
+        if refresh == warmup - 1:
+            gc.collect()
+            baseline, _ = tracemalloc.get_traced_memory()
+
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    growth = current - baseline
+    live = darksky.history.live_generations()
+    print(f"refreshes:        {refreshes} (after {warmup} warmup)")
+    print(f"generation:       {darksky.history.generation}")
+    print(f"live generations: {live}")
+    print(f"baseline memory:  {baseline / 1024:.1f} KiB")
+    print(f"final memory:     {current / 1024:.1f} KiB (peak {peak / 1024:.1f} KiB)")
+    print(f"growth:           {growth / 1024:.1f} KiB")
+
+    ok = True
+    if len(live) > SNAPSHOT_HISTORY_SIZE:
+        print(f"FAIL: {len(live)} snapshots alive, expected {SNAPSHOT_HISTORY_SIZE}")
+        ok = False
+    if growth > max_growth:
+        print(f"FAIL: memory grew more than {max_growth / 1024:.1f} KiB")
+        ok = False
+    if entities[0].state != round(coordinator.data.currently.temperature, 1):
+        print("FAIL: sensor does not show the latest snapshot")
+        ok = False
+    if weather.temperature != coordinator.data.currently.temperature:
+        print("FAIL: weather entity does not show the latest snapshot")
+        ok = False
+    return ok
+
+
+def main():
+    """Parse arguments and run the soak test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--refreshes", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument(
+        "--max-growth", type=int, default=512 * 1024, help="allowed growth in bytes"
+    )
+    args = parser.parse_args()
+    ok = asyncio.run(async_soak(args.refreshes, args.warmup, args.max_growth))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()